@@ -2,8 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import gi
-import threading
-import time
 import signal
 import sys
 
@@ -42,35 +40,48 @@ loop = GLib.MainLoop()
 index = 0
 selector = None
 
-def switcher():
+def _swap_cb(pad, info, new_pad):
+    # runs on the streaming thread while the pad is idle, so the switch
+    # never lands mid-buffer — no flush, no encoder GOP discard
+    selector.set_property("active-pad", new_pad)
+    return Gst.PadProbeReturn.REMOVE
+
+
+def make_switch_tick():
+    """Build the periodic switch callback for GLib.timeout_add_seconds."""
     pad_0 = selector.get_static_pad("sink_0")
     pad_1 = selector.get_static_pad("sink_1")
+    src_pad = selector.get_static_pad("src")
 
-    if not pad_0 or not pad_1:
+    if not pad_0 or not pad_1 or not src_pad:
         print("💀 failed to fetch static pads. something is deeply wrong.")
-        return
+        return None
 
     pads = [pad_0, pad_1]
-    index = 0
+    # caps are static once PLAYING — serialize each pad's caps at most once
+    # so the switch path skips the GObject query + string building
+    caps_strs = [None, None]
+    state = {"index": 0}
 
-    while True:
-        time.sleep(3)
+    def _tick():
+        index = state["index"]
         active = pads[index]
         print(f"🎥 switching to sink_{index}")
 
-        # flush so gstreamer doesn't act like it's in a coma
-        selector.send_event(Gst.Event.new_flush_start())
-        selector.send_event(Gst.Event.new_flush_stop(False))
-
-        selector.set_property("active-pad", active)
-
-        index = 1 - index
-
-        caps = active.get_current_caps()
-        print(f"🎯 active pad caps: {caps.to_string() if caps else 'n/a'}")
+        # swap atomically from an idle probe instead of flushing — flushing
+        # emptied the downstream queues and glitched PTS/PCR on every switch
+        src_pad.add_probe(Gst.PadProbeType.IDLE, _swap_cb, active)
 
+        if caps_strs[index] is None:
+            caps = active.get_current_caps()
+            if caps:
+                caps_strs[index] = caps.to_string()
+        print(f"🎯 active pad caps: {caps_strs[index] or 'n/a'}")
 
+        state["index"] = 1 - index
+        return True  # keep the timeout firing
 
+    return _tick
 
 
 def sig_handler(sig, frame):
@@ -99,8 +110,12 @@ def main():
     vsrc2.set_state(Gst.State.PLAYING)
 
 
-    # background thread for switching
-    threading.Thread(target=switcher, daemon=True).start()
+    # periodic switch on the GLib main loop — no sleeping thread, no
+    # cross-thread GObject calls
+    tick = make_switch_tick()
+    if tick is None:
+        return
+    GLib.timeout_add_seconds(3, tick)
 
     try:
         loop.run()
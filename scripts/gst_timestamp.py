@@ -1,34 +1,55 @@
 import gi
-import time
+import struct
+import sys
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
 
 Gst.init(None)
 
+# batch stdout writes so the streaming thread isn't stalled by an
+# unbuffered print per frame (which inflates the very delta we measure)
+FLUSH_EVERY = 256
+_lines = []
+
+# pass a *.bin path to capture raw records instead of text: two
+# little-endian int64s (pts ns, running-time ns) per frame. the analysis
+# scripts np.memmap these — no regex parsing at all on the way back
+_bin_path = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1].endswith(".bin") else None
+_bin_out = open(_bin_path, "wb", buffering=1 << 20) if _bin_path else None
+_pack = struct.Struct("<qq").pack
+
+# the pipeline clock is the one pts was stamped with — time.monotonic_ns
+# has a different epoch, so the old delta carried a bogus constant offset.
+# resolved once on the first sample (only valid after PLAYING).
+_clock = None
+_base = 0
+
 def on_new_sample(sink):
+    global _clock, _base
     sample = sink.emit("pull-sample")
     if not sample:
         return Gst.FlowReturn.ERROR
 
     buffer = sample.get_buffer()
     pts = buffer.pts
-    duration = buffer.duration
-
-    element = sink.get_parent()
-    clock = element.get_pipeline_clock()
-    base_time = element.get_base_time()
-
-    # current absolute pipeline time
-    abs_time = clock.get_time() if clock else Gst.CLOCK_TIME_NONE
 
-    # timestamp in absolute time
+    # keep this callback lean: it fires per frame
     if pts != Gst.CLOCK_TIME_NONE:
-        # ts_abs = base_time + pts
-        ts_abs = pts
-        now_ns = time.monotonic_ns()
-        now_gst_ns = int(now_ns)  # both are in ns
-        delta_ms = (now_gst_ns - ts_abs) / 1e6
-        print(f"PTS: {pts / 1e6:.3f} ms, Δ vs monotonic: {delta_ms:.3f} ms")
+        if _clock is None:
+            _clock = pipeline.get_clock()
+            _base = pipeline.get_base_time()
+        # running time: same timeline pts lives on
+        now_ns = _clock.get_time() - _base
+        if _bin_out is not None:
+            _bin_out.write(_pack(pts, now_ns))
+        else:
+            delta_ms = (now_ns - pts) / 1e6
+            _lines.append(
+                f"PTS: {pts / 1e6:.3f} ms, Δ vs monotonic: {delta_ms:.3f} ms\n"
+            )
+            if len(_lines) >= FLUSH_EVERY:
+                sys.stdout.write("".join(_lines))
+                _lines.clear()
     else:
         print("PTS not available. you’re driving blindfolded again.")
 
@@ -55,3 +76,7 @@ except KeyboardInterrupt:
     print("finally stopped your timestamp torture")
 finally:
     pipeline.set_state(Gst.State.NULL)
+    if _lines:
+        sys.stdout.write("".join(_lines))
+    if _bin_out is not None:
+        _bin_out.close()
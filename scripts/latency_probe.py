@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 import gi
+import numpy as np
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
 
 Gst.init(None)
 
+NUM_BUFFERS = 100
+
 src = Gst.ElementFactory.make("v4l2src", "source")
 identity = Gst.ElementFactory.make("identity", "tap")
 sink = Gst.ElementFactory.make("fakesink", "sink")
@@ -15,6 +18,11 @@ for e in (src, identity, sink):
 src.link(identity)
 identity.link(sink)
 
+# record into a preallocated array and report at EOS — a print per handoff
+# back-pressures the pipeline and skews the very DELTA we're measuring
+samples = np.empty((NUM_BUFFERS, 2), dtype=np.int64)
+count = [0]
+
 # timestamp tracking
 def on_handoff(identity, buffer, pad):
     pts_ns = buffer.pts
@@ -22,17 +30,18 @@ def on_handoff(identity, buffer, pad):
         # fallback in case v4l2src sucks
         pts_ns = Gst.util_get_timestamp()
     now_ns = GLib.get_monotonic_time() * 1000
-    delta_us = (now_ns - pts_ns) // 1000
-    print(f"SRC: v4l2src, DELTA={delta_us} us")
+    i = count[0]
+    if i < NUM_BUFFERS:
+        samples[i] = (pts_ns, now_ns)
+        count[0] = i + 1
 
 
 identity.connect("handoff", on_handoff)
 
 
-src.set_property("num-buffers", 100)
+src.set_property("num-buffers", NUM_BUFFERS)
 sink.set_property("sync", True)
 identity.set_property("signal-handoffs", True)
-identity.set_property("silent", False)
 
 pipeline.set_state(Gst.State.PLAYING)
 
@@ -40,3 +49,14 @@ bus = pipeline.get_bus()
 bus.timed_pop_filtered(Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS)
 
 pipeline.set_state(Gst.State.NULL)
+
+n = count[0]
+if n:
+    deltas_us = (samples[:n, 1] - samples[:n, 0]) // 1000
+    print(f"SRC: v4l2src, samples={n}")
+    print(f"  mean : {deltas_us.mean():.1f} us")
+    print(f"  p50  : {np.percentile(deltas_us, 50):.1f} us")
+    print(f"  p99  : {np.percentile(deltas_us, 99):.1f} us")
+    print(f"  max  : {deltas_us.max()} us")
+else:
+    print("no buffers observed. is the camera even plugged in?")
@@ -1,81 +1,146 @@
+import mmap
 import re
-import pandas as pd
+import numpy as np
 from datetime import timedelta
 import matplotlib.pyplot as plt
 
+# numba is optional — multi-hour captures get a compiled skip counter,
+# everyone else falls back to plain numpy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-def extract_pts_data(log_path):
-    with open(log_path, "r", encoding="utf-8") as file:
-        log_content = file.read()
+# bytes pattern so the scan never decodes the log to str
+LOG_PATTERN = re.compile(rb"PTS: (\d+\.\d+) ms \| .* monotonic: (\d+\.\d+) ms")
 
-    pattern = r"📍 PTS: (\d+\.\d+) ms \| ⏱️ Δ vs monotonic: (\d+\.\d+) ms"
-    matches = re.findall(pattern, log_content)
 
-    if not matches:
-        raise ValueError("no pts data found. did you upload a grocery list instead?")
+if njit is not None:
+
+    @njit(cache=True)
+    def _count_skips(delta, expected):
+        out = np.empty(delta.size, np.int32)
+        for i in range(delta.size):
+            v = delta[i] / expected
+            r = int(v + 0.5) - 1 if v == v else 0  # v != v catches the NaN prefix
+            out[i] = r if r > 0 else 0
+        return out
+
+else:
+
+    def _count_skips(delta, expected):
+        # one vectorized pass over the ndarray — no per-row python lambda
+        skips = np.rint(delta / expected) - 1
+        skips = np.where(np.isnan(skips), 0, skips)
+        return np.clip(skips, 0, None).astype(np.int32)
 
-    df = pd.DataFrame(matches, columns=["PTS", "Latency"])
-    df["PTS"] = df["PTS"].astype(float)
-    df["Latency"] = df["Latency"].astype(float)
-    df["Delta_PTS"] = df["PTS"].diff()
-    df["System_TS"] = df["PTS"] - df["Latency"]
 
-    start_time = df["PTS"].iloc[0]
-    df["Time"] = df["PTS"] - start_time
+def extract_pts_data(log_path):
+    if log_path.endswith(".bin"):
+        # binary capture from gst_timestamp.py — (pts ns, running-time ns) int64
+        # pairs, memmapped straight in: no regex, no parsing at all
+        rec = np.memmap(log_path, dtype=[("pts", "<i8"), ("now", "<i8")], mode="r")
+        pts = rec["pts"] / 1e6
+        lat = (rec["now"] - rec["pts"]) / 1e6
+    else:
+        # scan over an mmap — zero-copy file access, finditer yields matches
+        # lazily and np.fromiter packs them straight into the typed array
+        with open(log_path, "rb") as file:
+            try:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # zero-length log
+                mm = b""
+            rows = ((float(m[1]), float(m[2])) for m in LOG_PATTERN.finditer(mm))
+            arr = np.fromiter(rows, dtype=[("PTS", "f8"), ("Latency", "f8")])
+        # plain dict of ndarrays — pandas bought us nothing here except a
+        # 300 ms import and a BlockManager
+        pts = np.ascontiguousarray(arr["PTS"])
+        lat = np.ascontiguousarray(arr["Latency"])
+
+    if pts.size == 0:
+        raise ValueError("no pts data found. did you upload a grocery list instead?")
+    delta = np.diff(pts, prepend=np.nan)
 
-    return df
+    return {
+        "PTS": pts,
+        "Latency": lat,
+        "Delta_PTS": delta,
+        "System_TS": pts - lat,
+        "Time": pts - pts[0],
+    }
 
 
-def print_stats(df):
+def print_stats(cols):
     print("\n📊 BASIC STATS:")
     columns = ["PTS", "Delta_PTS", "System_TS", "Latency"]
     for col in columns:
+        values = cols[col]
         print(f"\n{col}:")
-        print(f"  Mean   : {df[col].mean():.3f}")
-        print(f"  StdDev : {df[col].std():.3f}")
-        print(f"  Min    : {df[col].min():.3f}")
-        print(f"  Max    : {df[col].max():.3f}")
-        print(f"  Median : {df[col].median():.3f}")
+        print(f"  Mean   : {np.nanmean(values):.3f}")
+        print(f"  StdDev : {np.nanstd(values, ddof=1):.3f}")
+        print(f"  Min    : {np.nanmin(values):.3f}")
+        print(f"  Max    : {np.nanmax(values):.3f}")
+        print(f"  Median : {np.nanmedian(values):.3f}")
 
     # frame skip stats
-    skips = df["Frame_Skips"]
+    skips = cols["Frame_Skips"]
     total_skips = skips.sum()
     skipped_points = skips[skips > 0]
+    n = len(cols["PTS"])
 
     print("\n📉 Frame Skips (Inferred):")
     print(f"  Total Skips      : {int(total_skips)}")
     print(
-        f"  Affected Samples : {len(skipped_points)} / {len(df)} ({100 * len(skipped_points) / len(df):.2f}%)"
+        f"  Affected Samples : {len(skipped_points)} / {n} ({100 * len(skipped_points) / n:.2f}%)"
     )
     print(
-        f"  Max Skip         : {int(skipped_points.max()) if not skipped_points.empty else 0}"
+        f"  Max Skip         : {int(skipped_points.max()) if skipped_points.size else 0}"
     )
     print(
         f"  Mean Skip        : {skipped_points.mean():.2f}"
-        if not skipped_points.empty
+        if skipped_points.size
         else "  Mean Skip        : N/A"
     )
     print(
-        f"  Median Skip      : {skipped_points.median():.2f}"
-        if not skipped_points.empty
+        f"  Median Skip      : {np.median(skipped_points):.2f}"
+        if skipped_points.size
         else "  Median Skip      : N/A"
     )
 
 
-def normalize_columns(df, columns):
+def normalize_columns(cols, columns):
     for col in columns:
-        mean = df[col].mean()
-        std = df[col].std()
-        df[f"{col}_norm"] = (df[col] - mean) / std
-    return df
+        values = cols[col]
+        mean = np.nanmean(values)
+        std = np.nanstd(values, ddof=1)
+        cols[f"{col}_norm"] = (values - mean) / std
+    return cols
 
 
-def plot_histograms(df, columns):
+def plot_histograms(cols, columns):
     for col in columns:
         plt.figure(figsize=(8, 4))
-        values = df[col].dropna()
-        weights = [100.0 / len(values)] * len(values)
-        plt.hist(values, bins=30, alpha=0.75, edgecolor="black", weights=weights)
+        values = cols[col]
+        values = values[~np.isnan(values)]
+        # uniform bins: assign indices with one multiply and count with
+        # np.bincount, which beats np.histogram's edge search
+        lo = values.min()
+        hi = values.max()
+        if hi == lo:
+            hi = lo + 1.0  # degenerate column — one fat bin beats a div by zero
+        idx = ((values - lo) * (30 / (hi - lo))).astype(np.int32)
+        idx = np.clip(idx, 0, 29)
+        counts = np.bincount(idx, minlength=30)
+        edges = np.linspace(lo, hi, 31)
+        pct = counts * (100.0 / len(values))
+        plt.bar(
+            edges[:-1],
+            pct,
+            width=np.diff(edges),
+            align="edge",
+            alpha=0.75,
+            edgecolor="black",
+        )
         plt.title(f"Histogram of {col} (percentage)")
         plt.xlabel(col)
         plt.ylabel("Percentage (%)")
@@ -84,42 +149,39 @@ def plot_histograms(df, columns):
         plt.show()
 
 
-def plot_pts(df, camera_switch_times=None):
+def plot_pts(cols, camera_switch_times=None):
     plt.figure(figsize=(12, 6))
 
-    # x-axis: ms diff from first PTS
-    time_ms = df["PTS"] - df["PTS"].iloc[0]
+    # pull the columns into locals once — no repeated dict lookups below
+    pts = cols["PTS"]
+    sys_ts = cols["System_TS"]
+    delta = cols["Delta_PTS"]
 
-    # scale to match Delta_PTS scale
-    pts_scaled = df["PTS"] - df["PTS"].iloc[0]
-    sys_scaled = df["System_TS"] - df["System_TS"].iloc[0]
-    scale_factor = df["Delta_PTS"].std() / pts_scaled.std()
+    # x-axis: ms diff from first PTS
+    time_ms = pts - pts[0]
+
+    # scale to match Delta_PTS scale — each std is an O(N) reduction, so
+    # compute them once up front and reuse
+    pts_scaled = pts - pts[0]
+    sys_scaled = sys_ts - sys_ts[0]
+    s_delta = np.nanstd(delta, ddof=1)
+    s_pts = np.nanstd(pts_scaled, ddof=1)
+    scale_factor = s_delta / s_pts
     pts_scaled *= scale_factor
     sys_scaled *= scale_factor
 
-    plt.plot(
-        time_ms.to_numpy(), pts_scaled.to_numpy(), label="PTS (scaled)", marker="o"
-    )
-    plt.plot(
-        time_ms.to_numpy(),
-        sys_scaled.to_numpy(),
-        label="System TS (scaled)",
-        linestyle="--",
-    )
-    plt.plot(
-        time_ms.to_numpy(), df["Delta_PTS"].to_numpy(), label="Δ PTS", linestyle=":"
-    )
+    plt.plot(time_ms, pts_scaled, label="PTS (scaled)", marker="o")
+    plt.plot(time_ms, sys_scaled, label="System TS (scaled)", linestyle="--")
+    plt.plot(time_ms, delta, label="Δ PTS", linestyle=":")
 
     if camera_switch_times:
-        for t in camera_switch_times:
-            x_ms = (df["PTS"].iloc[0] + t.total_seconds() * 1000) - df["PTS"].iloc[0]
-            plt.axvline(
-                x=x_ms,
-                color="red",
-                linestyle="-",
-                linewidth=1.5,
-                label="Camera Switch" if t == camera_switch_times[0] else "",
-            )
+        # one LineCollection via vlines instead of a Line2D per switch
+        xs = np.array([t.total_seconds() * 1000 for t in camera_switch_times])
+        ymin, ymax = plt.ylim()
+        plt.vlines(
+            xs, ymin, ymax, colors="red", linewidth=1.5, label="Camera Switch"
+        )
+        plt.ylim(ymin, ymax)
 
     plt.title("Scaled PTS vs System_TS vs ΔPTS (X: ms from first PTS)")
     plt.xlabel("Time since start (ms)")
@@ -130,62 +192,47 @@ def plot_pts(df, camera_switch_times=None):
     plt.show()
 
 
-import numpy as np  # make sure this is at the top
-
-
-def plot_pts_and_latency(df, camera_switch_times=None):
+def plot_pts_and_latency(cols, camera_switch_times=None):
     plt.figure(figsize=(12, 6))
 
+    # pull the columns into locals once — no repeated dict lookups below
+    pts = cols["PTS"]
+    lat = cols["Latency"]
+    delta = cols["Delta_PTS"]
+
     # x-axis: ms diff from first PTS
-    time_ms = df["PTS"] - df["PTS"].iloc[0]
+    time_ms = pts - pts[0]
 
-    # scale latency too
-    latency_scaled = df["Latency"] * (df["Delta_PTS"].std() / df["Latency"].std())
+    # scale latency too — hoist the stds out of the expression so each
+    # O(N) reduction runs exactly once
+    s_delta = np.nanstd(delta, ddof=1)
+    s_lat = np.nanstd(lat, ddof=1)
+    latency_scaled = lat * (s_delta / s_lat)
 
     # plot main signals
+    plt.plot(time_ms, delta, label="Δ PTS", linestyle=":")
     plt.plot(
-        time_ms.to_numpy(), df["Delta_PTS"].to_numpy(), label="Δ PTS", linestyle=":"
-    )
-    plt.plot(
-        time_ms.to_numpy(),
-        latency_scaled.to_numpy(),
+        time_ms,
+        latency_scaled,
         label="Latency (scaled)",
         linestyle="-.",
         color="tab:red",
     )
 
-    # # overlay lost frames
-    # lost_points = df[
-    #     (df["Frame_Skips"] > 0) & df["Delta_PTS"].notna() & time_ms.notna()
-    # ]
-    # delta_max = df["Delta_PTS"].dropna().max() * 1.1
-
-    # for i, row in lost_points.iterrows():
-    #     ts = time_ms.iloc[i]
-    #     if not pd.isna(ts) and np.isfinite(ts):
-    #         plt.axvline(x=ts, color="black", linestyle="--", alpha=0.4)
-    #         plt.text(
-    #             ts,
-    #             delta_max,
-    #             f"-{row['Frame_Skips']}",
-    #             rotation=90,
-    #             ha="center",
-    #             va="bottom",
-    #             fontsize=5,
-    #             color="black",
-    #         )
-
-    # camera switches
+    # camera switches — one LineCollection via vlines instead of a Line2D each
     if camera_switch_times:
-        for t in camera_switch_times:
-            x_ms = (df["PTS"].iloc[0] + t.total_seconds() * 1000) - df["PTS"].iloc[0]
-            plt.axvline(
-                x=x_ms,
-                color="blue",
-                linestyle="--",
-                linewidth=1.5,
-                label="Camera Switch" if t == camera_switch_times[0] else "",
-            )
+        xs = np.array([t.total_seconds() * 1000 for t in camera_switch_times])
+        ymin, ymax = plt.ylim()
+        plt.vlines(
+            xs,
+            ymin,
+            ymax,
+            colors="blue",
+            linestyles="--",
+            linewidth=1.5,
+            label="Camera Switch",
+        )
+        plt.ylim(ymin, ymax)
 
     plt.title("PTS, ΔPTS, Latency (scaled) + Inferred Frame Loss")
     plt.xlabel("Time since start (ms)")
@@ -196,36 +243,34 @@ def plot_pts_and_latency(df, camera_switch_times=None):
     plt.show()
 
 
-def estimate_dropped_frames(df, tolerance=1.5):
+def estimate_dropped_frames(cols, tolerance=1.5):
     """
     Estimate dropped frames based on excessive delta_PTS values.
 
     Parameters:
     - tolerance: float, multiplier on the median delta_PTS to allow before flagging
     """
-    expected_interval = df["Delta_PTS"].median()
-    df["Expected_Delta"] = expected_interval
-    df["Frame_Skips"] = (
-        (df["Delta_PTS"] / expected_interval).round().fillna(1) - 1
-    ).astype(int)
-    df["Frame_Skips"] = df["Frame_Skips"].apply(lambda x: x if x > 0 else 0)
-    return df
+    delta = cols["Delta_PTS"]
+    expected_interval = np.nanmedian(delta)
+    cols["Expected_Delta"] = np.full_like(delta, expected_interval)
+    cols["Frame_Skips"] = _count_skips(delta, expected_interval)
+    return cols
 
 
 if __name__ == "__main__":
     log_file = "video-hub.2025-04-24_17_03_08.log"
-    df = extract_pts_data(log_file)
+    cols = extract_pts_data(log_file)
 
     columns = ["PTS", "Delta_PTS", "System_TS", "Latency"]
-    df = normalize_columns(df, columns)
-    df = estimate_dropped_frames(df)
-    print_stats(df)
-    # plot_histograms(df, columns + [f"{col}_norm" for col in columns])
+    cols = normalize_columns(cols, columns)
+    cols = estimate_dropped_frames(cols)
+    print_stats(cols)
+    # plot_histograms(cols, columns + [f"{col}_norm" for col in columns])
 
     camera_switches = [
         # timedelta(seconds=2),  # add real values here
     ]
 
-    # plot_pts(df, camera_switch_times=camera_switches)
-    # plot_latency_time_series(df, camera_switch_times=camera_switches)
-    plot_pts_and_latency(df, camera_switch_times=camera_switches)
+    # plot_pts(cols, camera_switch_times=camera_switches)
+    # plot_latency_time_series(cols, camera_switch_times=camera_switches)
+    plot_pts_and_latency(cols, camera_switch_times=camera_switches)
@@ -1,78 +1,91 @@
+import mmap
 import re
-import pandas as pd
+import numpy as np
 from datetime import timedelta
 import matplotlib.pyplot as plt
 
+# bytes pattern so the scan never decodes the log to str
+LOG_PATTERN = re.compile(rb"PTS: (\d+\.\d+) ms \| .* monotonic: (\d+\.\d+) ms")
 
-def extract_pts_data(log_path):
-    with open(log_path, "r", encoding="utf-8") as file:
-        log_content = file.read()
 
-    # extract pts and delta vs monotonic
-    pattern = r"📍 PTS: (\d+\.\d+) ms \| ⏱️ Δ vs monotonic: (\d+\.\d+) ms"
-    matches = re.findall(pattern, log_content)
+def extract_pts_data(log_path):
+    if log_path.endswith(".bin"):
+        # binary capture from gst_timestamp.py — (pts ns, running-time ns) int64
+        # pairs, memmapped straight in: no regex, no parsing at all
+        rec = np.memmap(log_path, dtype=[("pts", "<i8"), ("now", "<i8")], mode="r")
+        pts = rec["pts"] / 1e6
+        drift = (rec["now"] - rec["pts"]) / 1e6
+    else:
+        # extract pts and delta vs monotonic over an mmap — zero-copy file
+        # access, finditer yields matches lazily and np.fromiter packs them
+        # straight into the typed array
+        with open(log_path, "rb") as file:
+            try:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # zero-length log
+                mm = b""
+            rows = ((float(m[1]), float(m[2])) for m in LOG_PATTERN.finditer(mm))
+            arr = np.fromiter(
+                rows, dtype=[("PTS", "f8"), ("Delta_vs_Monotonic", "f8")]
+            )
+        # plain dict of ndarrays — pandas bought us nothing here except a
+        # 300 ms import and a BlockManager
+        pts = np.ascontiguousarray(arr["PTS"])
+        drift = np.ascontiguousarray(arr["Delta_vs_Monotonic"])
 
-    if not matches:
+    if pts.size == 0:
         raise ValueError("no pts data found. did you upload a grocery list instead?")
 
-    df = pd.DataFrame(matches, columns=["PTS", "Delta_vs_Monotonic"])
-    df["PTS"] = df["PTS"].astype(float)
-    df["Delta_vs_Monotonic"] = df["Delta_vs_Monotonic"].astype(float)
-
     # calculate delta PTS between frames
-    df["Delta_PTS"] = df["PTS"].diff()
+    delta = np.diff(pts, prepend=np.nan)
 
     # calculate monotonic time (true timeline, PTS - drift)
-    df["Monotonic"] = df["PTS"] - df["Delta_vs_Monotonic"]
+    monotonic = pts - drift
 
-    # normalize to start time
-    start_time = df["Monotonic"].iloc[0]
-    df["Time"] = (df["Monotonic"] - start_time).apply(
-        lambda x: timedelta(milliseconds=x)
-    )
+    # normalize to start time — kept as float ms; the timedelta-per-row
+    # detour cost N python objects just to convert back at plot time
+    time_col = monotonic - monotonic[0]
 
-    return df
+    return {
+        "PTS": pts,
+        "Delta_vs_Monotonic": drift,
+        "Delta_PTS": delta,
+        "Monotonic": monotonic,
+        "Time": time_col,
+    }
 
 
-def print_stats(df):
+def print_stats(cols):
     print("\n📊 BASIC STATS:")
     columns = ["PTS", "Delta_PTS", "Monotonic", "Delta_vs_Monotonic"]
     for col in columns:
+        values = cols[col]
         print(f"\n{col}:")
-        print(f"  Mean   : {df[col].mean():.3f}")
-        print(f"  StdDev : {df[col].std():.3f}")
-        print(f"  Min    : {df[col].min():.3f}")
-        print(f"  Max    : {df[col].max():.3f}")
-        print(f"  Median : {df[col].median():.3f}")
+        print(f"  Mean   : {np.nanmean(values):.3f}")
+        print(f"  StdDev : {np.nanstd(values, ddof=1):.3f}")
+        print(f"  Min    : {np.nanmin(values):.3f}")
+        print(f"  Max    : {np.nanmax(values):.3f}")
+        print(f"  Median : {np.nanmedian(values):.3f}")
 
 
-def plot_pts(df, camera_switch_times=None):
+def plot_pts(cols, camera_switch_times=None):
     plt.figure(figsize=(12, 6))
 
-    # convert timedelta to seconds float for plotting
-    time_sec = df["Time"].apply(lambda td: td.total_seconds())
-
-    # force numpy arrays to shut pandas up
-    plt.plot(time_sec.to_numpy(), df["PTS"].to_numpy(), label="PTS", marker="o")
-    plt.plot(
-        time_sec.to_numpy(),
-        df["Monotonic"].to_numpy(),
-        label="Monotonic",
-        linestyle="--",
-    )
-    plt.plot(
-        time_sec.to_numpy(), df["Delta_PTS"].to_numpy(), label="Δ PTS", linestyle=":"
-    )
+    # ms -> s with one vectorized multiply
+    time_sec = cols["Time"] * 1e-3
+
+    plt.plot(time_sec, cols["PTS"], label="PTS", marker="o")
+    plt.plot(time_sec, cols["Monotonic"], label="Monotonic", linestyle="--")
+    plt.plot(time_sec, cols["Delta_PTS"], label="Δ PTS", linestyle=":")
 
     if camera_switch_times:
-        for t in camera_switch_times:
-            plt.axvline(
-                x=float(t.total_seconds()),
-                color="red",
-                linestyle="-",
-                linewidth=1.5,
-                label="Camera Switch" if t == camera_switch_times[0] else "",
-            )
+        # one LineCollection via vlines instead of a Line2D per switch
+        xs = np.array([t.total_seconds() for t in camera_switch_times])
+        ymin, ymax = plt.ylim()
+        plt.vlines(
+            xs, ymin, ymax, colors="red", linewidth=1.5, label="Camera Switch"
+        )
+        plt.ylim(ymin, ymax)
 
     plt.title("PTS vs Monotonic Time")
     plt.xlabel("Time since start (s)")
@@ -85,13 +98,13 @@ def plot_pts(df, camera_switch_times=None):
 
 if __name__ == "__main__":
     log_file = "video-hub.2025-04-24_17_03_08.log"
-    df = extract_pts_data(log_file)
+    cols = extract_pts_data(log_file)
 
-    print_stats(df)
+    print_stats(cols)
 
     # TODO: provide actual camera switch event times if you ever decide to be useful
     camera_switches = [
         # timedelta(seconds=2),
     ]
 
-    plot_pts(df, camera_switch_times=camera_switches)
+    plot_pts(cols, camera_switch_times=camera_switches)